@@ -0,0 +1,527 @@
+"""
+Structured exporters for OCR results: hOCR, ALTO XML, searchable PDF and JSONL.
+
+Pages are written as soon as they are recognized, so a batch of any size is
+never held in memory as a whole document. Each page is rendered to bytes and
+written in a single call to a large buffered file, and nothing time- or
+machine-dependent is written, so the same input always gives the same bytes.
+
+    python exporters.py --format pdf --output scans.pdf page1.png page2.png ...
+"""
+import os
+import json
+import zlib
+import struct
+import argparse
+from html import escape
+
+from PIL import Image, ImageSequence
+
+BUFFER_SIZE = 1024 * 1024
+
+
+def page_lines(image, lang="eng"):
+    """Recognize an image and group the words into lines.
+
+    Returns a list of lines in reading order; each line is a dict with its
+    block number, bounding box (left, top, width, height) and words, where
+    every word has text, bbox and conf (0-100).
+    """
+    import pytesseract
+
+    data = pytesseract.image_to_data(image, lang=lang, output_type=pytesseract.Output.DICT)
+
+    lines = {}
+    for i, text in enumerate(data["text"]):
+        text = text.strip()
+        if data["level"][i] != 5 or not text:
+            continue
+        key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+        bbox = (data["left"][i], data["top"][i], data["width"][i], data["height"][i])
+        word = {"text": text, "bbox": bbox, "conf": max(0, round(float(data["conf"][i])))}
+        lines.setdefault(key, []).append(word)
+
+    result = []
+    for (block, _, _), words in lines.items():
+        result.append({"block": block, "bbox": _union(w["bbox"] for w in words), "words": words})
+    return result
+
+
+def _union(bboxes):
+    """Smallest (left, top, width, height) box containing all the given boxes"""
+    bboxes = list(bboxes)
+    left = min(b[0] for b in bboxes)
+    top = min(b[1] for b in bboxes)
+    right = max(b[0] + b[2] for b in bboxes)
+    bottom = max(b[1] + b[3] for b in bboxes)
+    return (left, top, right - left, bottom - top)
+
+
+def _block_boxes(lines):
+    """Map each block number to the box around its lines"""
+    blocks = {}
+    for line in lines:
+        blocks.setdefault(line["block"], []).append(line["bbox"])
+    return {block: _union(boxes) for block, boxes in blocks.items()}
+
+
+def _corners(bbox):
+    """hOCR wants x0 y0 x1 y1"""
+    left, top, width, height = bbox
+    return f"{left} {top} {left + width} {top + height}"
+
+
+class Exporter:
+    """Base class: writes a header, one chunk per page and a footer.
+
+    Output goes to "<path>.part" and is only moved to path by close(), so a
+    batch that fails halfway never leaves a valid-looking document behind.
+    """
+
+    extension = ""
+
+    def __init__(self, path):
+        self.path = path
+        self.partial_path = path + ".part"
+        self.file = open(self.partial_path, "wb", buffering=BUFFER_SIZE)
+        self.page_count = 0
+        self.write(self.header())
+
+    def write(self, data):
+        self.file.write(data)
+
+    def add_page(self, image, lines, source=""):
+        """Write one recognized page (lines as returned by page_lines)"""
+        self.page_count += 1
+        self.write(self.render_page(image, lines, source))
+
+    def close(self):
+        """Finish the document and move it into place"""
+        if self.file.closed:
+            return
+        self.write(self.footer())
+        self.file.close()
+        os.replace(self.partial_path, self.path)
+
+    def abort(self):
+        """Throw away everything written so far"""
+        if self.file.closed:
+            return
+        self.file.close()
+        try:
+            os.remove(self.partial_path)
+        except OSError:
+            pass
+
+    def header(self):
+        return b""
+
+    def render_page(self, image, lines, source):
+        raise NotImplementedError
+
+    def footer(self):
+        return b""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+class JsonlExporter(Exporter):
+    """One JSON object per page with word boxes and confidences"""
+
+    extension = ".jsonl"
+
+    def render_page(self, image, lines, source):
+        record = {
+            "page": self.page_count,
+            "source": source,
+            "width": image.width,
+            "height": image.height,
+            "text": "\n".join(" ".join(w["text"] for w in line["words"]) for line in lines),
+            "lines": [
+                {
+                    "bbox": list(line["bbox"]),
+                    "words": [
+                        {"text": w["text"], "bbox": list(w["bbox"]), "conf": w["conf"]}
+                        for w in line["words"]
+                    ],
+                }
+                for line in lines
+            ],
+        }
+        return (json.dumps(record, ensure_ascii=False, sort_keys=True, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class HocrExporter(Exporter):
+    """hOCR 1.2 (XHTML) with page, area, line and word elements"""
+
+    extension = ".hocr"
+
+    def header(self):
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Transitional//EN"\n'
+            '    "http://www.w3.org/TR/xhtml1/DTD/xhtml1-transitional.dtd">\n'
+            '<html xmlns="http://www.w3.org/1999/xhtml" xml:lang="en" lang="en">\n'
+            '<head>\n'
+            '  <title></title>\n'
+            '  <meta http-equiv="Content-Type" content="text/html;charset=utf-8"/>\n'
+            '  <meta name="ocr-system" content="ubuntu-text-capture"/>\n'
+            '  <meta name="ocr-capabilities" content="ocr_page ocr_carea ocr_line ocrx_word"/>\n'
+            '</head>\n'
+            '<body>\n'
+        ).encode("utf-8")
+
+    def render_page(self, image, lines, source):
+        n = self.page_count
+        parts = [
+            f'  <div class="ocr_page" id="page_{n}" '
+            f'title="image {escape(json.dumps(source))}; bbox 0 0 {image.width} {image.height}; ppageno {n - 1}">\n'
+        ]
+        blocks = _block_boxes(lines)
+        block = None
+        for i, line in enumerate(lines, 1):
+            if line["block"] != block:
+                if block is not None:
+                    parts.append("   </div>\n")
+                block = line["block"]
+                parts.append(f'   <div class="ocr_carea" id="block_{n}_{block}" '
+                             f'title="bbox {_corners(blocks[block])}">\n')
+
+            parts.append(f'    <span class="ocr_line" id="line_{n}_{i}" title="bbox {_corners(line["bbox"])}">')
+            parts.append(" ".join(
+                f'<span class="ocrx_word" id="word_{n}_{i}_{j}" '
+                f'title="bbox {_corners(w["bbox"])}; x_wconf {w["conf"]}">{escape(w["text"])}</span>'
+                for j, w in enumerate(line["words"], 1)
+            ))
+            parts.append("</span>\n")
+        if block is not None:
+            parts.append("   </div>\n")
+        parts.append("  </div>\n")
+        return "".join(parts).encode("utf-8")
+
+    def footer(self):
+        return b"</body>\n</html>\n"
+
+
+class AltoExporter(Exporter):
+    """ALTO v4 XML, one Page element per image"""
+
+    extension = ".xml"
+
+    def header(self):
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<alto xmlns="http://www.loc.gov/standards/alto/ns-v4#" '
+            'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+            'xsi:schemaLocation="http://www.loc.gov/standards/alto/ns-v4# '
+            'http://www.loc.gov/alto/v4/alto-4-2.xsd">\n'
+            '  <Description>\n'
+            '    <MeasurementUnit>pixel</MeasurementUnit>\n'
+            '    <OCRProcessing ID="OCR_0">\n'
+            '      <ocrProcessingStep>\n'
+            '        <processingSoftware><softwareName>ubuntu-text-capture</softwareName></processingSoftware>\n'
+            '      </ocrProcessingStep>\n'
+            '    </OCRProcessing>\n'
+            '  </Description>\n'
+            '  <Layout>\n'
+        ).encode("utf-8")
+
+    @staticmethod
+    def _box(bbox):
+        left, top, width, height = bbox
+        return f'HPOS="{left}" VPOS="{top}" WIDTH="{width}" HEIGHT="{height}"'
+
+    def render_page(self, image, lines, source):
+        n = self.page_count
+        full = (0, 0, image.width, image.height)
+        parts = [
+            f'    <Page ID="page_{n}" PHYSICAL_IMG_NR="{n}" WIDTH="{image.width}" HEIGHT="{image.height}">\n',
+            f'      <PrintSpace {self._box(full)}>\n',
+        ]
+        blocks = _block_boxes(lines)
+        block = None
+        for i, line in enumerate(lines, 1):
+            if line["block"] != block:
+                if block is not None:
+                    parts.append("        </TextBlock>\n")
+                block = line["block"]
+                parts.append(f'        <TextBlock ID="block_{n}_{block}" {self._box(blocks[block])}>\n')
+
+            parts.append(f'          <TextLine ID="line_{n}_{i}" {self._box(line["bbox"])}>\n')
+            words = [
+                f'            <String ID="string_{n}_{i}_{j}" {self._box(w["bbox"])} '
+                f'WC="{w["conf"] / 100:.2f}" CONTENT="{escape(w["text"])}"/>\n'
+                for j, w in enumerate(line["words"], 1)
+            ]
+            parts.append('            <SP/>\n'.join(words))
+            parts.append("          </TextLine>\n")
+        if block is not None:
+            parts.append("        </TextBlock>\n")
+        parts.append("      </PrintSpace>\n")
+        parts.append("    </Page>\n")
+        return "".join(parts).encode("utf-8")
+
+    def footer(self):
+        return b"  </Layout>\n</alto>\n"
+
+
+def _pdf_string(text):
+    """Encode text as a hex string of UTF-16 code units (the font's CIDs)"""
+    return b"<" + text.encode("utf-16-be").hex().upper().encode("ascii") + b">"
+
+
+# Maps every two-byte CID to the same UTF-16 code unit, so text extraction
+# gets back exactly what was written
+TO_UNICODE_CMAP = b"""/CIDInit /ProcSet findresource begin
+12 dict begin
+begincmap
+/CIDSystemInfo << /Registry (Adobe) /Ordering (UCS) /Supplement 0 >> def
+/CMapName /Adobe-Identity-UCS def
+/CMapType 2 def
+1 begincodespacerange
+<0000> <FFFF>
+endcodespacerange
+1 beginbfrange
+<0000> <FFFF> <0000>
+endbfrange
+endcmap
+CMapName currentdict /CMap defineresource pop
+end
+end"""
+
+
+def _truetype(tables):
+    """Assemble a TrueType file from {tag: table data}"""
+    def checksum(data):
+        data += b"\0" * (-len(data) % 4)
+        return sum(struct.unpack(">%dI" % (len(data) // 4), data)) & 0xFFFFFFFF
+
+    count = len(tables)
+    power = 1 << (count.bit_length() - 1)
+    directory = struct.pack(">IHHHH", 0x00010000, count, power * 16, power.bit_length() - 1,
+                            (count - power) * 16)
+    offset = len(directory) + 16 * count
+    records, body = [], b""
+    for tag in sorted(tables):
+        data = tables[tag]
+        records.append(struct.pack(">4sIII", tag.encode("ascii"), checksum(data), offset + len(body), len(data)))
+        body += data + b"\0" * (-len(data) % 4)
+    font = directory + b"".join(records) + body
+
+    # head.checkSumAdjustment makes the whole file sum to a fixed value
+    head = offset + body.index(tables["head"])
+    adjustment = (0xB1B0AFBA - checksum(font)) & 0xFFFFFFFF
+    return font[:head + 8] + struct.pack(">I", adjustment) + font[head + 12:]
+
+
+def _glyphless_font():
+    """A TrueType font with .notdef and one empty glyph, both 0.5 em wide.
+
+    Like Tesseract's own PDF renderer, the text layer uses this font so
+    viewers find an embedded program instead of looking for GlyphLessFont.
+    """
+    name = "GlyphLessFont".encode("utf-16-be")
+    names = [(1, name), (2, "Regular".encode("utf-16-be")), (4, name), (6, name)]
+    records, strings = b"", b""
+    for name_id, value in names:
+        records += struct.pack(">HHHHHH", 3, 1, 0x409, name_id, len(value), len(strings))
+        strings += value
+
+    return _truetype({
+        "head": struct.pack(">IIIIHHqqhhhhHHhhh", 0x00010000, 0x00010000, 0, 0x5F0F3CF5, 0x000B, 1000,
+                            0, 0, 0, 0, 500, 1000, 0, 3, 2, 0, 0),
+        "hhea": struct.pack(">Ihhh" "H" "hhhhhh" "hhhh" "hH", 0x00010000, 1000, 0, 0,
+                            500, 0, 0, 500, 1, 0, 0, 0, 0, 0, 0, 0, 2),
+        "maxp": struct.pack(">IH13H", 0x00010000, 2, 0, 0, 0, 0, 2, 0, 0, 0, 0, 0, 0, 0, 0),
+        "hmtx": struct.pack(">hhhh", 500, 0, 500, 0),
+        "loca": struct.pack(">HHH", 0, 0, 0),  # Both glyphs are empty
+        "glyf": b"",
+        "cmap": struct.pack(">HHHHI" "HHHHHHH" "HHHhH", 0, 1, 3, 1, 12,
+                            4, 24, 0, 2, 2, 0, 0, 0xFFFF, 0, 0xFFFF, 1, 0),
+        "name": struct.pack(">HHH", 0, len(names), 6 + len(records)) + records + strings,
+        "OS/2": struct.pack(">HhHHH10hh10s4I4sHHHhhhHH2I", 1, 500, 400, 5, 0,
+                            650, 700, 0, 140, 650, 700, 0, 480, 50, 250, 0, b"\0" * 10,
+                            0, 0, 0, 0, b"    ", 0x40, 0x20, 0xFFFF, 1000, 0, 0, 1000, 0, 1, 0),
+        "post": struct.pack(">IIhhIIIII", 0x00030000, 0, -100, 50, 1, 0, 0, 0, 0),
+    })
+
+
+GLYPHLESS_FONT = _glyphless_font()
+# Every CID draws glyph 1 (two bytes per CID, big-endian)
+CID_TO_GID_MAP = b"\x00\x01" * 65536
+
+
+class PdfExporter(Exporter):
+    """Searchable PDF: the page image with an invisible text layer on top.
+
+    Objects are written as pages arrive; only their byte offsets are kept
+    for the cross-reference table written by close().
+    """
+
+    extension = ".pdf"
+
+    CATALOG = 1
+    PAGES = 2
+    FONT = 3
+    CID_FONT = 4
+    FONT_DESCRIPTOR = 5
+    TO_UNICODE = 6
+    CID_TO_GID = 7
+    FONT_FILE = 8
+
+    def __init__(self, path, dpi=96):
+        self.scale = 72 / dpi  # Pixels to points
+        self.offsets = {}
+        self.position = 0
+        self.page_objects = []
+        self.next_object = 9
+        super().__init__(path)
+
+    def write(self, data):
+        self.file.write(data)
+        self.position += len(data)
+
+    def _object(self, number, body, stream=None):
+        """Serialize one indirect object, recording where it starts"""
+        self.offsets[number] = self.position + len(self._pending)
+        parts = [b"%d 0 obj\n" % number, body]
+        if stream is not None:
+            parts += [b"\nstream\n", stream, b"\nendstream"]
+        parts.append(b"\nendobj\n")
+        self._pending += b"".join(parts)
+
+    def header(self):
+        self._pending = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._object(self.CATALOG, b"<< /Type /Catalog /Pages 2 0 R >>")
+        # Glyphless composite font: the text is never drawn, it only has to
+        # carry Unicode for search and copy, in any script
+        self._object(self.FONT, b"<< /Type /Font /Subtype /Type0 /BaseFont /GlyphLessFont "
+                                b"/Encoding /Identity-H /DescendantFonts [4 0 R] /ToUnicode 6 0 R >>")
+        self._object(self.CID_FONT, b"<< /Type /Font /Subtype /CIDFontType2 /BaseFont /GlyphLessFont "
+                                    b"/CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) /Supplement 0 >> "
+                                    b"/FontDescriptor 5 0 R /CIDToGIDMap 7 0 R /DW 500 >>")
+        self._object(self.FONT_DESCRIPTOR, b"<< /Type /FontDescriptor /FontName /GlyphLessFont /Flags 5 "
+                                           b"/FontBBox [0 0 500 1000] /ItalicAngle 0 /Ascent 1000 "
+                                           b"/Descent 0 /CapHeight 1000 /StemV 80 /FontFile2 8 0 R >>")
+        self._object(self.TO_UNICODE, b"<< /Length %d >>" % len(TO_UNICODE_CMAP), TO_UNICODE_CMAP)
+        cid_to_gid = zlib.compress(CID_TO_GID_MAP, 9)
+        self._object(self.CID_TO_GID, b"<< /Filter /FlateDecode /Length %d >>" % len(cid_to_gid), cid_to_gid)
+        font = zlib.compress(GLYPHLESS_FONT, 9)
+        self._object(self.FONT_FILE, b"<< /Filter /FlateDecode /Length %d /Length1 %d >>"
+                     % (len(font), len(GLYPHLESS_FONT)), font)
+        return self._flush()
+
+    def _flush(self):
+        data, self._pending = bytes(self._pending), bytearray()
+        return data
+
+    def _text_layer(self, lines, page_height):
+        """Invisible text (render mode 3) placed over each word"""
+        ops = [b"BT 3 Tr"]
+        for line in lines:
+            for j, w in enumerate(line["words"]):
+                left, top, width, height = (v * self.scale for v in w["bbox"])
+                if width <= 0 or height <= 0:
+                    continue
+                size = height
+                # Every glyph is 0.5 em wide; stretch the word to its box
+                units = len(w["text"].encode("utf-16-be")) // 2
+                stretch = 100 * width / (0.5 * size * units)
+                baseline = page_height - top - height
+                # A trailing space (outside the box) keeps words apart when extracted
+                text = w["text"] + (" " if j + 1 < len(line["words"]) else "")
+                ops.append(b"/F1 %.2f Tf %.2f Tz 1 0 0 1 %.2f %.2f Tm %s Tj"
+                           % (size, stretch, left, baseline, _pdf_string(text)))
+        ops.append(b"ET")
+        return b"\n".join(ops)
+
+    def render_page(self, image, lines, source):
+        image_obj, content_obj, page_obj = range(self.next_object, self.next_object + 3)
+        self.next_object += 3
+        self.page_objects.append(page_obj)
+
+        rgb = image.convert("RGB")
+        width, height = rgb.width * self.scale, rgb.height * self.scale
+
+        pixels = zlib.compress(rgb.tobytes(), 6)
+        self._object(image_obj, b"<< /Type /XObject /Subtype /Image /Width %d /Height %d "
+                                b"/ColorSpace /DeviceRGB /BitsPerComponent 8 "
+                                b"/Filter /FlateDecode /Length %d >>"
+                     % (rgb.width, rgb.height, len(pixels)), pixels)
+
+        content = zlib.compress(
+            b"q %.2f 0 0 %.2f 0 0 cm /Im0 Do Q\n" % (width, height) + self._text_layer(lines, height), 6
+        )
+        self._object(content_obj, b"<< /Filter /FlateDecode /Length %d >>" % len(content), content)
+
+        self._object(page_obj, b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %.2f %.2f] "
+                               b"/Resources << /Font << /F1 3 0 R >> /XObject << /Im0 %d 0 R >> >> "
+                               b"/Contents %d 0 R >>"
+                     % (width, height, image_obj, content_obj))
+        return self._flush()
+
+    def footer(self):
+        kids = b" ".join(b"%d 0 R" % n for n in self.page_objects)
+        self._object(self.PAGES, b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(self.page_objects)))
+
+        # Cross-reference table; object 0 is the free-list head
+        xref_position = self.position + len(self._pending)
+        size = self.next_object
+        xref = [b"xref\n0 %d\n" % size, b"0000000000 65535 f \n"]
+        for number in range(1, size):
+            xref.append(b"%010d 00000 n \n" % self.offsets[number])
+        self._pending += b"".join(xref)
+        self._pending += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, xref_position)
+        return self._flush()
+
+
+EXPORTERS = {
+    "hocr": HocrExporter,
+    "alto": AltoExporter,
+    "pdf": PdfExporter,
+    "jsonl": JsonlExporter,
+}
+
+
+def iter_pages(paths):
+    """Yield (image, source name) for every page of every file, one at a time"""
+    for path in paths:
+        with Image.open(path) as image:
+            frames = getattr(image, "n_frames", 1)
+            for index, frame in enumerate(ImageSequence.Iterator(image)):
+                source = os.path.basename(path)
+                if frames > 1:
+                    source = f"{source}[{index}]"
+                yield frame.convert("RGB"), source
+
+
+def export_batch(paths, output, fmt, lang="eng", progress=None):
+    """Recognize every page of the given files and stream them into one export"""
+    with EXPORTERS[fmt](output) as exporter:
+        for image, source in iter_pages(paths):
+            exporter.add_page(image, page_lines(image, lang), source)
+            if progress:
+                progress(exporter.page_count, source)
+        return exporter.page_count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export OCR results of images to hOCR, ALTO, PDF or JSONL")
+    parser.add_argument("images", nargs="+", help="Image files (multi-page TIFFs are split into pages)")
+    parser.add_argument("-f", "--format", choices=sorted(EXPORTERS), required=True)
+    parser.add_argument("-o", "--output", help="Output file (default: first image name with the format's extension)")
+    parser.add_argument("--lang", default="eng", help="Tesseract language (default: eng)")
+    args = parser.parse_args()
+
+    output = args.output or os.path.splitext(args.images[0])[0] + EXPORTERS[args.format].extension
+    count = export_batch(args.images, output, args.format, args.lang,
+                         progress=lambda n, source: print(f"Page {n}: {source}"))
+    print(f"Exported {count} pages to {output}")
@@ -0,0 +1,298 @@
+"""
+Incremental re-recognition of overlapping captures.
+
+A capture is cut into horizontal text bands (runs of rows containing ink)
+and the text recognized for each band is kept. When the next capture
+arrives it is aligned against the previous one (vertical and horizontal
+offsets from cross-correlating the ink profiles), and a band is reused only
+if its pixels are unchanged at the aligned position. Only new or changed
+bands go to Tesseract, so scrolling through a long document only pays for
+the lines that scrolled into view.
+
+Whenever the whole image has to be recognized (first capture, mostly new
+content, multi-column layouts or no detectable text bands) the result is
+Tesseract's own text output, exactly as without incremental recognition.
+A capture whose lines are all unchanged returns the previous text as is.
+"""
+import numpy as np
+
+INK_THRESHOLD = 48  # Grey level difference from the background that counts as ink
+BAND_GAP = 2  # Rows without ink that still belong to the same band (i dots, accents)
+BAND_PADDING = 3  # Rows of context kept around a band when it is recognized
+PIXEL_TOLERANCE = 8  # Largest grey level difference for a pixel to count as unchanged
+COLUMN_GAP = 4  # A blank run wider than this many band heights means several columns
+FULL_RECOGNITION_RATIO = 0.6  # Above this share of changed bands, redo the whole image
+CANDIDATE_OFFSETS = 3  # Vertical offsets voted by identical bands tried besides the correlation peak
+
+
+class Band:
+    """One line of text in a capture"""
+
+    def __init__(self, top, bottom, left, right):
+        self.top = top
+        self.bottom = bottom  # Exclusive
+        self.left = left  # Ink extent, right exclusive
+        self.right = right
+        self.signature = None  # Exact pixels of the ink, used to propose offsets
+        self.text = ""
+
+    @property
+    def height(self):
+        return self.bottom - self.top
+
+
+def _ink_mask(gray):
+    background = np.median(gray)
+    return np.abs(gray.astype(np.int16) - int(background)) > INK_THRESHOLD
+
+
+def find_bands(ink):
+    """Return the text bands of an ink mask, top to bottom"""
+    rows = np.flatnonzero(ink.any(axis=1))
+    if rows.size == 0:
+        return []
+
+    # Split wherever the gap between inked rows is larger than BAND_GAP
+    breaks = np.flatnonzero(np.diff(rows) > BAND_GAP + 1)
+    starts = np.concatenate(([rows[0]], rows[breaks + 1]))
+    ends = np.concatenate((rows[breaks], [rows[-1]])) + 1
+
+    bands = []
+    for top, bottom in zip(starts.tolist(), ends.tolist()):
+        columns = np.flatnonzero(ink[top:bottom].any(axis=0))
+        bands.append(Band(top, bottom, int(columns[0]), int(columns[-1]) + 1))
+    return bands
+
+
+def has_columns(ink, band):
+    """True if a band has a blank stretch wide enough to separate columns"""
+    columns = np.flatnonzero(ink[band.top:band.bottom].any(axis=0))
+    gaps = np.diff(columns) - 1
+    return gaps.size > 0 and gaps.max() > COLUMN_GAP * band.height
+
+
+def _profile_offset(before, after):
+    """Shift between two 1-D ink profiles: after[i] shows what was at before[i + offset]"""
+    before = before - before.mean()
+    after = after - after.mean()
+    if not before.any() or not after.any():
+        return 0
+
+    correlation = np.correlate(before, after, mode="full")
+    lags = np.arange(len(correlation)) - (len(after) - 1)
+
+    # Average over the overlapping part so small overlaps aren't penalised,
+    # but ignore shifts that leave less than a quarter in common
+    overlap = np.minimum(len(before), len(after) + lags) - np.maximum(0, lags)
+    valid = overlap >= min(len(before), len(after)) / 4
+    if not valid.any():
+        return 0
+    score = np.where(valid, correlation / np.maximum(overlap, 1), -np.inf)
+    return int(lags[np.argmax(score)])
+
+
+def vertical_offset(previous_ink, ink):
+    """Rows the content moved up by since the previous capture.
+
+    A row y of the new capture shows what was at row y + offset before.
+    """
+    return _profile_offset(previous_ink.mean(axis=1), ink.mean(axis=1))
+
+
+def horizontal_offset(previous_ink, ink):
+    """Columns the content moved left by since the previous capture"""
+    return _profile_offset(previous_ink.mean(axis=0), ink.mean(axis=0))
+
+
+def _parse_tsv(tsv):
+    """Turn Tesseract's TSV output into the dict image_to_data returns"""
+    rows = [row.split("\t") for row in tsv.strip("\n").split("\n")]
+    header = rows.pop(0) if rows else []
+    data = {name: [] for name in header}
+    for row in rows:
+        row = row + [""] * (len(header) - len(row))
+        for name, value in zip(header, row):
+            data[name].append(value if name == "text" else int(float(value)))
+    return data
+
+
+class IncrementalRecognizer:
+    """Tesseract recognition that reuses unchanged lines from the previous capture"""
+
+    def __init__(self, lang="eng"):
+        self.lang = lang
+        self.previous_gray = None
+        self.previous_ink = None
+        self.previous_bands = {}  # (top, bottom) -> Band
+        self.previous_text = ""
+        self.last_stats = {}
+
+    def reset(self):
+        self.previous_gray = None
+        self.previous_ink = None
+        self.previous_bands = {}
+        self.previous_text = ""
+
+    def _unchanged(self, band, gray, dy, dx):
+        """Reuse test: same band position and same pixels at the aligned place"""
+        old = self.previous_bands.get((band.top + dy, band.bottom + dy))
+        if old is None:
+            return None
+
+        # Columns present in both captures once shifted by dx
+        left = max(0, -dx)
+        right = min(gray.shape[1], self.previous_gray.shape[1] - dx)
+        if band.left < left or band.right > right:
+            return None  # Part of the line is newly exposed
+
+        now = gray[band.top:band.bottom, left:right].astype(np.int16)
+        before = self.previous_gray[old.top:old.bottom, left + dx:right + dx].astype(np.int16)
+        if np.abs(now - before).max() > PIXEL_TOLERANCE:
+            return None
+        return old
+
+    def _align(self, gray, ink, bands):
+        """Pick the offsets under which the most bands are unchanged.
+
+        Returns (dy, dx, {band: previous band}).
+        """
+        dx = horizontal_offset(self.previous_ink, ink)
+        candidates = [vertical_offset(self.previous_ink, ink)]
+
+        # Repetitive layouts make the correlation peak ambiguous, so also try
+        # the shifts that line up the most pixel-identical bands
+        previous_tops = {}
+        for old in self.previous_bands.values():
+            previous_tops.setdefault(old.signature, []).append(old.top)
+        votes = {}
+        for band in bands:
+            for top in previous_tops.get(band.signature, ()):
+                votes[top - band.top] = votes.get(top - band.top, 0) + 1
+        candidates += sorted(votes, key=lambda dy: (-votes[dy], abs(dy)))[:CANDIDATE_OFFSETS]
+
+        best = (0, 0, {})
+        for dy in dict.fromkeys(candidates):
+            for shift in dict.fromkeys((dx, 0)):
+                matches = {}
+                for band in bands:
+                    old = self._unchanged(band, gray, dy, shift)
+                    if old is not None:
+                        matches[band] = old
+                if len(matches) > len(best[2]):
+                    best = (dy, shift, matches)
+        return best
+
+    @staticmethod
+    def _assign_words(bands, data, top):
+        """Give each band the words Tesseract found on it (top is the crop's offset)"""
+        words = {band: [] for band in bands}
+        for i, text in enumerate(data["text"]):
+            text = text.strip()
+            if data["level"][i] != 5 or not text:
+                continue
+            centre = top + data["top"][i] + data["height"][i] / 2
+            # Words between bands go to the nearest one
+            band = min(bands, key=lambda b: 0 if b.top <= centre < b.bottom
+                       else min(abs(centre - b.top), abs(centre - b.bottom)))
+            line = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+            words[band].append((line, data["left"][i], text))
+
+        for band, band_words in words.items():
+            lines = {}
+            for line, left, text in sorted(band_words):
+                lines.setdefault(line, []).append(text)
+            band.text = "\n".join(" ".join(line) for line in lines.values())
+
+    def _recognize_full(self, image, bands):
+        """One Tesseract pass over the whole image; returns its plain text output"""
+        import pytesseract
+
+        # Plain text for the result and word boxes for the bands, from one run
+        text, tsv = pytesseract.run_and_get_multiple_output(image, ["txt", "tsv"], lang=self.lang)
+        if bands:
+            self._assign_words(bands, _parse_tsv(tsv), 0)
+        return text
+
+    def _recognize_region(self, image, bands):
+        """Run Tesseract once over a run of adjacent bands"""
+        import pytesseract
+
+        top = max(0, bands[0].top - BAND_PADDING)
+        bottom = min(image.height, bands[-1].bottom + BAND_PADDING)
+        data = pytesseract.image_to_data(
+            image.crop((0, top, image.width, bottom)),
+            lang=self.lang,
+            config="--psm 6",  # A cropped run of lines is a single block
+            output_type=pytesseract.Output.DICT
+        )
+        self._assign_words(bands, data, top)
+
+    def recognize(self, image):
+        """Recognize a capture, reusing unchanged lines of the previous one"""
+        image = image.convert("RGB")
+        gray = np.asarray(image.convert("L"))
+        ink = _ink_mask(gray)
+        bands = find_bands(ink)
+        for band in bands:
+            crop = gray[band.top:band.bottom, band.left:band.right]
+            band.signature = (crop.shape, hash(crop.tobytes()))
+
+        dy, dx, matches = 0, 0, {}
+        # Band-by-band splicing only holds for a single column of text
+        if self.previous_bands and bands and not any(has_columns(ink, band) for band in bands):
+            dy, dx, matches = self._align(gray, ink, bands)
+        changed = [band for band in bands if band not in matches]
+
+        full = not matches or len(changed) > FULL_RECOGNITION_RATIO * len(bands)
+        if full:
+            text = self._recognize_full(image, bands)
+        elif not changed and len(matches) == len(self.previous_bands):
+            # Same lines as last time: give back the same text, whichever
+            # way it was produced, so an unchanged screen copies identically
+            for band, old in matches.items():
+                band.text = old.text
+            text = self.previous_text
+        else:
+            for band, old in matches.items():
+                band.text = old.text
+
+            # One Tesseract call per run of adjacent changed bands
+            run = []
+            for band in bands:
+                if band in matches:
+                    if run:
+                        self._recognize_region(image, run)
+                        run = []
+                else:
+                    run.append(band)
+            if run:
+                self._recognize_region(image, run)
+            text = self._join(bands)
+
+        self.previous_gray = gray
+        self.previous_ink = ink
+        self.previous_bands = {(band.top, band.bottom): band for band in bands}
+        self.previous_text = text
+        self.last_stats = {
+            "bands": len(bands),
+            "recognized": len(bands) if full else len(changed),
+            "full": full,
+            "offset": (dx, dy),
+        }
+        return text
+
+    @staticmethod
+    def _join(bands):
+        """Join band texts, keeping paragraph breaks where the gap is large"""
+        gaps = [b.top - a.bottom for a, b in zip(bands, bands[1:])]
+        typical = float(np.median(gaps)) if gaps else 0.0
+        parts = []
+        previous = None
+        for band in bands:
+            if not band.text:
+                continue
+            if previous is not None:
+                parts.append("\n\n" if band.top - previous.bottom > 1.8 * typical + 1 else "\n")
+            parts.append(band.text)
+            previous = band
+        return "".join(parts)
@@ -2,6 +2,7 @@ PROJECT_DIR=$(pwd)
 VENV_DIR="$PROJECT_DIR/venv"
 REQUIREMENTS_FILE="$PROJECT_DIR/requirements.txt"
 SCRIPT_PATH="$PROJECT_DIR/text_capture.sh"
+QUICK_SCRIPT_PATH="$PROJECT_DIR/text_capture_quick.sh"
 
 sudo apt install gnome-screenshot tesseract-ocr-all libtesseract-dev xclip python3-venv
 
@@ -36,6 +37,14 @@ source $VENV_DIR/bin/activate && python3 $PROJECT_DIR/main.py
 EOL
 
     chmod +x $SCRIPT_PATH
+
+    echo "Creating text_capture_quick.sh script..."
+    cat <<EOL > $QUICK_SCRIPT_PATH
+#!/bin/bash
+source $VENV_DIR/bin/activate && python3 $PROJECT_DIR/quick_capture.py "\$@"
+EOL
+
+    chmod +x $QUICK_SCRIPT_PATH
 }
 
 echo "Starting installation..."
@@ -54,3 +63,7 @@ echo "You can now use the following path to set up the keyboard shortcut manuall
 echo ""
 echo "$SCRIPT_PATH"
 echo ""
+echo "For capturing straight to the clipboard without opening the window, use:"
+echo ""
+echo "$QUICK_SCRIPT_PATH"
+echo ""
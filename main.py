@@ -1,6 +1,5 @@
 import os
 import sys
-import subprocess
 import tempfile
 import platform
 import traceback
@@ -10,6 +9,9 @@ import pyperclip
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import threading
+from pipeline import CapturePipeline, CaptureJob
+from screen_capture import run_capture_tool
+from incremental import IncrementalRecognizer
 
 # Optional sv_ttk import with fallback
 try:
@@ -31,6 +33,15 @@ all_labels = []
 latex_ocr = None  # Will be initialized when needed
 current_ocr_engine = "pytesseract"  # Default OCR engine
 current_tesseract_lang = "eng"  # Default language for Tesseract
+capture_pipeline = None  # Created in show_gui
+restore_after_capture = False  # Window was minimized for a capture
+incremental_recognizers = {}  # Tesseract language -> IncrementalRecognizer
+current_text = ""  # Full OCR result, even while it is still being inserted
+text_insert_job = None  # Pending after() call of a chunked insert
+
+# Results above this size are inserted in chunks so Tk stays responsive
+LARGE_TEXT_THRESHOLD = 64 * 1024
+TEXT_CHUNK_SIZE = 16 * 1024
 
 
 def update_colors(theme):
@@ -186,37 +197,39 @@ def capture_screenshot():
     if not initialize_ocr():
         return
         
-    # Minimize the main window while taking screenshots
-    root.iconify()
-    root.update()
-    
-    temp_dir = tempfile.gettempdir()
-    screenshot_path = os.path.join(temp_dir, "screenshot.png")
+    global restore_after_capture
+
+    # Each capture gets its own file since several can be in flight
+    fd, screenshot_path = tempfile.mkstemp(prefix="screenshot-", suffix=".png")
+    os.close(fd)
     system = platform.system()
 
     try:
-        if system == "Linux":
-            tools = [
-                ["gnome-screenshot", "-a", "-f", screenshot_path],
-                ["maim", "-s", screenshot_path],
-                ["import", screenshot_path],
-                ["scrot", "-s", screenshot_path]
-            ]
-            success = False
-            for tool in tools:
-                try:
-                    subprocess.run(tool, check=True)
-                    success = True
-                    break
-                except (subprocess.SubprocessError, FileNotFoundError):
-                    continue
-                
-            if not success:
-                root.deiconify()  # Restore window
-                messagebox.showerror("Error", "No supported screenshot tool found.")
+        if system in ("Linux", "Darwin"):
+            # The screenshot tool runs in the pipeline's capture stage
+            job = CaptureJob(
+                screenshot_path,
+                engine=current_ocr_engine,
+                lang=current_tesseract_lang,
+                temporary=True,
+                capture=True
+            )
+            # Minimize the main window while taking screenshots
+            root.iconify()
+            restore_after_capture = True
+            if not capture_pipeline.submit(job):
+                job.remove_temporary_file()
+                root.deiconify()
+                messagebox.showwarning("Busy", "Capture queue is full, please wait for the pending captures.")
                 return False
+            update_pipeline_status()
+            return True
 
         elif system == "Windows":
+            # Minimize the main window while taking screenshots
+            root.iconify()
+            root.update()
+
             # Use a better Windows screenshot approach
             try:
                 from PIL import ImageGrab
@@ -312,20 +325,12 @@ def capture_screenshot():
                 screen = ImageGrab.grab()
                 screen.save(screenshot_path)
 
-        elif system == "Darwin":  # macOS
-            subprocess.run(["screencapture", "-i", screenshot_path], check=True)
         else:
-            root.deiconify()  # Restore window
+            os.remove(screenshot_path)
             messagebox.showerror("Error", f"Unsupported operating system: {system}")
             return False
 
-        if not os.path.exists(screenshot_path) or os.path.getsize(screenshot_path) == 0:
-            root.deiconify()  # Restore window
-            messagebox.showerror("Error", "Screenshot was not captured.")
-            return False
-
         root.deiconify()  # Restore window before processing
-        messagebox.showinfo("Success", f"Screenshot captured")
         process_screenshot(screenshot_path)
         return True
 
@@ -368,74 +373,109 @@ def open_image():
         messagebox.showerror("Error", f"Failed to open file dialog: {str(e)}")
         traceback.print_exc()
 
-def process_screenshot(screenshot_path):
-    # Show busy cursor
-    root.config(cursor="watch")
-    root.update()
-    
-    try:
-        screenshot = Image.open(screenshot_path).convert("RGB")
-    except Exception as e:
-        root.config(cursor="")  # Restore cursor
-        messagebox.showerror("Error", f"Failed to open image: {str(e)}")
-        return
-        
-    global copied_to_clipboard
-    if screenshot is None:
-        messagebox.showerror("Error", "No screenshot available.")
-        return
-    
-    # After taking the screenshot but before processing it, restore the window
-    root.deiconify()
-    root.lift()
-    root.attributes('-topmost', True)
-    root.focus_force()
-    root.after(500, lambda: root.attributes('-topmost', False))
-
-    try:
-        # Process based on selected OCR engine
-        if current_ocr_engine == "pytesseract":
-            # Use pytesseract for OCR with selected language
-            text = pytesseract.image_to_string(screenshot, lang=current_tesseract_lang)
-            
-        elif current_ocr_engine == "latexocr":
-            # Use LatexOCR for math equation recognition
-            if HAS_LATEX_OCR and latex_ocr:
-                # Process the image and get LaTeX code
-                text = latex_ocr(screenshot)
-            else:
-                text = "LatexOCR not properly initialized. Please install pix2tex package."
-        else:
-            text = "Unknown OCR engine selected."
+def recognize_image(image, engine, lang):
+    """Run the selected OCR engine on a PIL image"""
+    if engine == "pytesseract":
+        # Use pytesseract for OCR with selected language, reusing the lines
+        # that haven't changed since the previous capture
+        if lang not in incremental_recognizers:
+            incremental_recognizers[lang] = IncrementalRecognizer(lang)
+        return incremental_recognizers[lang].recognize(image)
+    elif engine == "latexocr":
+        # Use LatexOCR for math equation recognition
+        if HAS_LATEX_OCR and latex_ocr:
+            return latex_ocr(image)
+        return "LatexOCR not properly initialized. Please install pix2tex package."
+    return "Unknown OCR engine selected."
+
+# Pipeline stages, run in worker threads (no Tk calls here)
+
+def capture_stage(job):
+    if job.capture:
+        if not run_capture_tool(job.path):
+            raise RuntimeError("No supported screenshot tool found.")
+        if not os.path.exists(job.path) or os.path.getsize(job.path) == 0:
+            raise RuntimeError("Screenshot was not captured.")
+
+def decode_stage(job):
+    # Temporary files are removed by the pipeline once the job comes out
+    job.image = Image.open(job.path)
+    job.image.load()
+
+def preprocess_stage(job):
+    job.image = job.image.convert("RGB")
+
+def recognize_stage(job):
+    job.text = recognize_image(job.image, job.engine, job.lang)
+
+def publish_stage(job):
+    # Copy to clipboard automatically
+    pyperclip.copy(job.text)
+
+PIPELINE_STAGES = [
+    ("capture", capture_stage),
+    ("decode", decode_stage),
+    ("preprocess", preprocess_stage),
+    ("recognize", recognize_stage),
+    ("publish", publish_stage),
+]
 
-        # Copy to clipboard automatically
-        pyperclip.copy(text)
-        
-        # Update the existing GUI
-        update_gui(screenshot, text)
-        
-    except Exception as e:
-        root.config(cursor="")  # Restore cursor
-        messagebox.showerror("Error", f"OCR processing error:\n{str(e)}")
-        traceback.print_exc()
-    finally:
-        # Only remove if it's a temporary file
-        if screenshot_path.startswith(tempfile.gettempdir()):
-            try:
-                os.remove(screenshot_path)
-            except:
-                pass
-        
-        # Restore cursor
-        root.config(cursor="")
+def process_screenshot(screenshot_path):
+    """Queue an image file for recognition"""
+    job = CaptureJob(
+        screenshot_path,
+        engine=current_ocr_engine,
+        lang=current_tesseract_lang,
+        temporary=screenshot_path.startswith(tempfile.gettempdir())
+    )
+    if not capture_pipeline.submit(job):
+        job.remove_temporary_file()
+        messagebox.showwarning("Busy", "Capture queue is full, please wait for the pending captures.")
+        return False
+    update_pipeline_status()
+    return True
+
+def update_pipeline_status():
+    """Show queue depth and per-stage latency in the text panel header"""
+    pending = capture_pipeline.pending()
+    root.config(cursor="watch" if pending else "")
+    # Stay quiet until the first capture has gone through
+    if pending or capture_pipeline.stages[0].count:
+        pipeline_status_label.config(text=f"{pending} pending · {capture_pipeline.format_stats()}")
+
+def poll_pipeline():
+    """Collect finished captures on the Tk thread"""
+    global restore_after_capture
+
+    for job in capture_pipeline.get_results():
+        if job.error:
+            messagebox.showerror("Error", job.error)
+            continue
+
+        update_gui(job.image, job.text)
+
+        # Bring the window to the front for the new result
+        root.deiconify()
+        root.lift()
+        root.attributes('-topmost', True)
+        root.focus_force()
+        root.after(500, lambda: root.attributes('-topmost', False))
+        restore_after_capture = False
+
+    # Restore the window once the user has finished selecting regions
+    if restore_after_capture and capture_pipeline.pending("capture") == 0:
+        root.deiconify()
+        restore_after_capture = False
+
+    update_pipeline_status()
+    root.after(50, poll_pipeline)
 
 def update_gui(image, text):
     """Update the existing GUI with new image and text"""
     global state
     
     # Update text
-    text_widget.delete("1.0", tk.END)
-    text_widget.insert("1.0", text if text else "")
+    set_text(text if text else "")
     
     # Update image
     state["original_image"] = image
@@ -463,6 +503,52 @@ def update_gui(image, text):
     # Force a redraw of the image
     force_redraw_image()
 
+def chunk_end(text, start, size=None):
+    """End of the chunk of text starting at start, at most size characters.
+
+    Breaks after the last line end in the chunk so wrapping is only
+    recomputed for whole lines; a longer line is cut at size.
+    """
+    end = start + (size or TEXT_CHUNK_SIZE)
+    if end >= len(text):
+        return len(text)
+    newline = text.rfind("\n", start, end)
+    if newline > start:
+        end = newline + 1
+    return end
+
+def set_text(text):
+    """Replace the contents of the text panel"""
+    global current_text, text_insert_job
+
+    current_text = text
+
+    # Drop whatever is left of a previous large result
+    if text_insert_job is not None:
+        root.after_cancel(text_insert_job)
+        text_insert_job = None
+
+    text_widget.delete("1.0", tk.END)
+
+    # Small results go in at once
+    if len(text) <= LARGE_TEXT_THRESHOLD:
+        text_widget.insert("1.0", text)
+        return
+
+    def insert_chunk(start):
+        global text_insert_job
+
+        end = chunk_end(text, start)
+        text_widget.insert(tk.END + "-1c", text[start:end])
+
+        if end < len(text):
+            # Let Tk handle events and redraw before the next chunk
+            text_insert_job = root.after(1, insert_chunk, end)
+        else:
+            text_insert_job = None
+
+    insert_chunk(0)
+
 def force_redraw_image():
     """Force a redraw of the image on the canvas"""
     # Get current canvas dimensions
@@ -528,6 +614,7 @@ def show_gui(original_image=None, text=None):
     global root, text_widget, canvas, text_card, image_card
     global title_frame, text_header, img_header, img_info_label, theme_frame, theme_toggle
     global state, ocr_engine_combo, ocr_engine_frame, tesseract_lang_frame, tesseract_lang_combo
+    global capture_pipeline, pipeline_status_label
 
     root = tk.Tk()
     root.title("Screenshot OCR")
@@ -689,11 +776,19 @@ def show_gui(original_image=None, text=None):
     text_title.pack(side=tk.LEFT)
     all_labels.append(text_title)
 
+    # Capture queue depth and stage latency
+    pipeline_status_label = tk.Label(text_header, text="", font=("Segoe UI", 9), bg="#e8e8ef")
+    pipeline_status_label.pack(side=tk.LEFT, padx=10)
+    all_labels.append(pipeline_status_label)
+
     ttk.Button(
         text_header,
         text="Copy to Clipboard",
         style="Custom.TButton",
-        command=lambda: pyperclip.copy(text_widget.get("1.0", tk.END).strip())
+        command=lambda: pyperclip.copy(
+            # Use the full result if it is still being inserted
+            (current_text if text_insert_job is not None else text_widget.get("1.0", tk.END)).strip()
+        )
     ).pack(side=tk.RIGHT)
 
     text_container = ttk.Frame(text_card, padding=(10, 5, 10, 10))
@@ -707,7 +802,7 @@ def show_gui(original_image=None, text=None):
         relief="flat", borderwidth=0
     )
     text_widget.grid(row=0, column=0, sticky="nsew")
-    text_widget.insert("1.0", text if text else "")
+    set_text(text if text else "")
 
     scrollbar = ttk.Scrollbar(text_container, orient=tk.VERTICAL, command=text_widget.yview)
     scrollbar.grid(row=0, column=1, sticky="ns")
@@ -787,8 +882,13 @@ def show_gui(original_image=None, text=None):
     root.update()
     root.after(100, resize_image)
 
+    # Start the capture pipeline and poll it for results
+    capture_pipeline = CapturePipeline(PIPELINE_STAGES)
+    root.after(50, poll_pipeline)
+
     # Make sure Windows properly closes the app
     def on_closing():
+        capture_pipeline.shutdown()
         root.destroy()
         
     root.protocol("WM_DELETE_WINDOW", on_closing)
@@ -0,0 +1,170 @@
+"""
+Asynchronous capture pipeline.
+
+Each stage runs in its own thread and hands jobs to the next one through a
+bounded queue, so a slow stage (usually recognition) makes the earlier ones
+wait instead of letting work pile up. Every stage has a single worker, which
+keeps results in the order the captures were submitted.
+"""
+import os
+import time
+import queue
+import threading
+import itertools
+
+
+class CaptureJob:
+    """A single capture travelling through the pipeline"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, path=None, engine=None, lang=None, temporary=False, capture=False):
+        self.id = next(self._ids)
+        self.path = path
+        self.capture = capture  # Run the screenshot tool to create path first
+        self.temporary = temporary  # Remove the file once the job leaves the pipeline
+        self.engine = engine
+        self.lang = lang
+        self.image = None
+        self.text = None
+        self.error = None
+        self.timings = {}  # stage name -> seconds
+        self.submitted = time.perf_counter()
+
+    def remove_temporary_file(self):
+        """Delete the job's file if the pipeline owns it, whatever the outcome"""
+        if self.temporary and self.path:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+
+class Stage(threading.Thread):
+    """Worker thread running one pipeline step"""
+
+    def __init__(self, name, func, inbox, outbox):
+        super().__init__(name=f"pipeline-{name}", daemon=True)
+        self.stage_name = name
+        self.func = func
+        self.inbox = inbox
+        self.outbox = outbox
+        self.busy = False  # Holding a job, including while waiting on the next queue
+        self.count = 0
+        self.total_time = 0.0
+        self.last_time = 0.0
+
+    def run(self):
+        while True:
+            job = self.inbox.get()
+            if job is None:
+                self.outbox.put(None)
+                return
+
+            # Failed jobs skip the remaining steps but still come out in order
+            self.busy = True
+            if job.error is None:
+                start = time.perf_counter()
+                try:
+                    self.func(job)
+                except Exception as e:
+                    job.error = f"{self.stage_name} failed: {e}"
+                elapsed = time.perf_counter() - start
+
+                job.timings[self.stage_name] = elapsed
+                self.count += 1
+                self.total_time += elapsed
+                self.last_time = elapsed
+
+            # Blocks while the next queue is full (backpressure); the job
+            # still counts as held by this stage until it is handed over
+            self.outbox.put(job)
+            self.busy = False
+
+
+class CapturePipeline:
+    """Chain of stages connected by bounded queues.
+
+    stages is a list of (name, func) pairs; each func takes a CaptureJob and
+    fills in its fields. Finished jobs are collected from results.
+    """
+
+    def __init__(self, stages, maxsize=4):
+        self.queues = [queue.Queue(maxsize=maxsize) for _ in stages]
+        self.results = queue.Queue()
+        self.stages = []
+        self.in_flight = 0  # Submitted but not yet collected
+        self.lock = threading.Lock()
+
+        for i, (name, func) in enumerate(stages):
+            outbox = self.queues[i + 1] if i + 1 < len(stages) else self.results
+            self.stages.append(Stage(name, func, self.queues[i], outbox))
+
+        for stage in self.stages:
+            stage.start()
+
+    def submit(self, job):
+        """Queue a job without blocking; returns False if the pipeline is full"""
+        with self.lock:
+            try:
+                self.queues[0].put_nowait(job)
+            except queue.Full:
+                return False
+            self.in_flight += 1
+            return True
+
+    def get_results(self):
+        """Return all finished jobs without blocking"""
+        finished = []
+        while True:
+            try:
+                job = self.results.get_nowait()
+            except queue.Empty:
+                return finished
+            if job is not None:
+                job.remove_temporary_file()
+                with self.lock:
+                    self.in_flight -= 1
+                finished.append(job)
+
+    def pending(self, stage_name=None):
+        """Number of jobs waiting in or held by a stage (or the whole pipeline)"""
+        if stage_name is None:
+            with self.lock:
+                return self.in_flight
+        total = 0
+        for stage in self.stages:
+            if stage.stage_name == stage_name:
+                total += stage.inbox.qsize() + (1 if stage.busy else 0)
+        return total
+
+    def stats(self):
+        """Queue depth and latency per stage, in milliseconds"""
+        return [
+            {
+                "stage": stage.stage_name,
+                "depth": stage.inbox.qsize(),
+                "busy": stage.busy,
+                "last_ms": stage.last_time * 1000,
+                "avg_ms": stage.total_time / stage.count * 1000 if stage.count else 0.0,
+            }
+            for stage in self.stages
+        ]
+
+    def format_stats(self):
+        """One-line summary of stats() for the status bar"""
+        return "  ".join(
+            f"{s['stage']} [{s['depth']}{'+1' if s['busy'] else ''}] {s['avg_ms']:.0f} ms"
+            for s in self.stats()
+        )
+
+    def shutdown(self):
+        """Ask the stages to stop after the queued jobs, without blocking.
+
+        If the first queue is full the request is dropped; the stages are
+        daemon threads and end with the process anyway.
+        """
+        try:
+            self.queues[0].put_nowait(None)
+        except queue.Full:
+            pass
@@ -0,0 +1,302 @@
+"""
+Quick capture without the main window.
+
+    python quick_capture.py              Capture a region, OCR it, copy the text
+    python quick_capture.py --resident   Stay in the background and wait for the
+                                         hotkey or for the command above
+    python quick_capture.py --show       Open the full window
+    python quick_capture.py --stats      Print capture latency statistics
+    python quick_capture.py --stop       Stop the resident process
+
+When a resident process is running, a plain invocation just asks it to
+capture, which skips interpreter and OCR start-up. Heavy modules are only
+imported on first use so the resident process stays small while idle.
+"""
+import os
+import sys
+import time
+import socket
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+
+from screen_capture import run_capture_tool
+
+# Ctrl+Shift+T is the shortcut suggested for the full window in the README
+DEFAULT_HOTKEY = "<ctrl>+<alt>+<shift>+t"
+SOCKET_PATH = os.path.join(
+    os.environ.get("XDG_RUNTIME_DIR", tempfile.gettempdir()),
+    f"text-capture-{os.getuid() if hasattr(os, 'getuid') else 0}.sock"
+)
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+
+
+def notify(title, message):
+    """Show a desktop notification, falling back to the terminal"""
+    system = platform.system()
+    try:
+        if system == "Linux":
+            subprocess.run(["notify-send", "-a", "Text Capture", "-t", "3000", title, message],
+                           check=True)
+            return
+        elif system == "Darwin":
+            # Text is passed as arguments, never spliced into the script source
+            subprocess.run(["osascript",
+                            "-e", "on run argv",
+                            "-e", "display notification (item 1 of argv) with title (item 2 of argv)",
+                            "-e", "end run",
+                            "--", message, title], check=True)
+            return
+    except (subprocess.SubprocessError, FileNotFoundError):
+        pass
+    print(f"{title}: {message}")
+
+
+class LatencyStats:
+    """Latencies of the captures made so far.
+
+    hotkey-to-clipboard includes the time the user spends selecting the
+    region; selection-to-clipboard is what the program itself costs.
+    """
+
+    def __init__(self):
+        self.total = []
+        self.processing = []
+        self.lock = threading.Lock()
+
+    def record(self, total, processing):
+        with self.lock:
+            self.total.append(total)
+            self.processing.append(processing)
+
+    @staticmethod
+    def _describe(label, samples):
+        samples = sorted(samples)
+
+        def percentile(p):
+            return samples[min(len(samples) - 1, int(p * len(samples)))] * 1000
+
+        mean = sum(samples) / len(samples) * 1000
+        return (f"{label}: mean {mean:.0f} ms, p50 {percentile(0.5):.0f} ms, "
+                f"p95 {percentile(0.95):.0f} ms, max {samples[-1] * 1000:.0f} ms")
+
+    def summary(self):
+        with self.lock:
+            total = list(self.total)
+            processing = list(self.processing)
+        if not total:
+            return "No captures yet"
+
+        return "\n".join([
+            f"{len(total)} captures",
+            self._describe("  selection-to-clipboard", processing),
+            self._describe("  hotkey-to-clipboard   ", total),
+        ])
+
+
+class QuickCapture:
+    """Region capture → recognition → clipboard, without any Tk window"""
+
+    def __init__(self, lang="eng"):
+        self.lang = lang
+        self.stats = LatencyStats()
+        self.lock = threading.Lock()  # One region selection at a time
+        self.recognizer = None  # Created on first capture
+
+    def recognize(self, image):
+        # Keeps the previous capture's lines so re-captures only OCR what changed
+        if self.recognizer is None:
+            from incremental import IncrementalRecognizer
+            self.recognizer = IncrementalRecognizer(self.lang)
+        return self.recognizer.recognize(image)
+
+    def capture(self, triggered_at=None):
+        """Run one capture.
+
+        Returns (text, hotkey-to-clipboard, selection-to-clipboard) with
+        times in seconds, or (None, None, None) if nothing was captured.
+        """
+        if triggered_at is None:
+            triggered_at = time.time()
+
+        if not self.lock.acquire(blocking=False):
+            return None, None, None  # A capture is already in progress
+
+        path = None
+        try:
+            fd, path = tempfile.mkstemp(prefix="screenshot-", suffix=".png")
+            os.close(fd)
+            if not run_capture_tool(path) or os.path.getsize(path) == 0:
+                return None, None, None
+            selected_at = time.time()
+
+            from PIL import Image
+            import pyperclip
+
+            with Image.open(path) as image:
+                text = self.recognize(image.convert("RGB"))
+            pyperclip.copy(text)
+
+            copied_at = time.time()
+            latency = copied_at - triggered_at
+            processing = copied_at - selected_at
+            self.stats.record(latency, processing)
+        except Exception as e:
+            notify("Text Capture", f"Capture failed: {e}")
+            return None, None, None
+        finally:
+            self.lock.release()
+            if path is not None:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+        preview = " ".join(text.split())
+        if len(preview) > 80:
+            preview = preview[:77] + "..."
+        notify("Text copied", f"{preview or '(no text found)'}\n"
+                              f"{len(text)} characters in {processing * 1000:.0f} ms")
+        print(f"Captured {len(text)} characters, selection-to-clipboard {processing * 1000:.0f} ms, "
+              f"hotkey-to-clipboard {latency * 1000:.0f} ms")
+        return text, latency, processing
+
+
+def show_window():
+    """Start the full GUI in its own process"""
+    subprocess.Popen([sys.executable, MAIN_SCRIPT])
+
+
+def send_command(command):
+    """Send a command to the resident process; returns its reply or None if none is running"""
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(SOCKET_PATH)
+            client.sendall(command.encode())
+            client.shutdown(socket.SHUT_WR)
+            return client.makefile().read()
+    except (FileNotFoundError, ConnectionRefusedError):
+        return None
+
+
+def handle_command(quick, command):
+    """Run a command received by the resident process and build the reply"""
+    name, _, arg = command.partition(" ")
+    if name == "capture":
+        text, latency, processing = quick.capture(float(arg) if arg else None)
+        if text is None:
+            return "No text captured"
+        return (f"Copied {len(text)} characters in {processing * 1000:.0f} ms after selection "
+                f"({latency * 1000:.0f} ms after the request)")
+    elif name == "show":
+        show_window()
+        return "Opening window"
+    elif name == "stats":
+        return quick.stats.summary()
+    return f"Unknown command: {name}"
+
+
+def serve(lang="eng", hotkey=DEFAULT_HOTKEY):
+    """Wait for the hotkey or for commands from other invocations"""
+    has_socket = hasattr(socket, "AF_UNIX")
+    # Checked before grabbing the hotkey so a second instance never registers it
+    if has_socket and send_command("stats") is not None:
+        print("A resident process is already running.")
+        return
+
+    quick = QuickCapture(lang)
+
+    if hotkey:
+        # Optional pynput import with fallback; only the resident process needs it
+        try:
+            from pynput import keyboard
+        except ImportError:
+            keyboard = None
+
+        if keyboard is not None:
+            def on_hotkey():
+                triggered_at = time.time()
+                threading.Thread(target=quick.capture, args=(triggered_at,), daemon=True).start()
+
+            keyboard.GlobalHotKeys({hotkey: on_hotkey}).start()
+            print(f"Listening for {hotkey}")
+        else:
+            print("pynput is not installed, global hotkey disabled. "
+                  "Bind 'quick_capture.py' to a shortcut in your desktop settings instead.")
+
+    if not has_socket:
+        # No command socket on this platform, the hotkey is the only trigger
+        threading.Event().wait()
+        return
+
+    if os.path.exists(SOCKET_PATH):
+        os.remove(SOCKET_PATH)  # Left over from a process that crashed
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(SOCKET_PATH)
+    os.chmod(SOCKET_PATH, 0o600)
+    server.listen()
+    print(f"Resident mode, waiting for commands on {SOCKET_PATH}")
+
+    def reply_to(conn, command):
+        with conn:
+            try:
+                reply = handle_command(quick, command)
+            except Exception as e:
+                reply = f"Error: {e}"
+            conn.sendall(reply.encode())
+
+    try:
+        while True:
+            conn, _ = server.accept()
+            command = conn.makefile().read().strip()
+            if command == "quit":
+                conn.sendall(b"Stopped")
+                conn.close()
+                break
+            # Don't hold up other commands while the user selects a region
+            threading.Thread(target=reply_to, args=(conn, command), daemon=True).start()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        os.remove(SOCKET_PATH)
+        print(quick.stats.summary())
+
+
+def main():
+    started = time.time()
+    parser = argparse.ArgumentParser(description="Capture a screen region and copy its text")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--resident", action="store_true", help="Stay in the background and wait for triggers")
+    group.add_argument("--show", action="store_true", help="Open the full window")
+    group.add_argument("--stats", action="store_true", help="Print latency statistics of the resident process")
+    group.add_argument("--stop", action="store_true", help="Stop the resident process")
+    parser.add_argument("--lang", default="eng", help="Tesseract language (default: eng)")
+    parser.add_argument("--hotkey", default=DEFAULT_HOTKEY,
+                        help=f"Global hotkey in pynput format (default: {DEFAULT_HOTKEY}), empty to disable")
+    args = parser.parse_args()
+
+    if args.resident:
+        serve(args.lang, args.hotkey)
+    elif args.show:
+        if send_command("show") is None:
+            show_window()
+    elif args.stats or args.stop:
+        reply = send_command("stats" if args.stats else "quit")
+        print(reply if reply is not None else "No resident process running.")
+    else:
+        reply = send_command(f"capture {time.time()}")
+        if reply is None:
+            # Nothing resident, do the capture in this process
+            QuickCapture(args.lang).capture(started)
+        else:
+            print(reply)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""
+Interactive region capture with the platform's screenshot tool.
+
+Kept free of Tk and OCR imports so both the main window and the quick
+capture launcher can use it cheaply.
+"""
+import platform
+import subprocess
+
+
+def run_capture_tool(screenshot_path):
+    """Run the platform's interactive region capture tool; returns True on success"""
+    if platform.system() == "Darwin":
+        tools = [["screencapture", "-i", screenshot_path]]
+    else:
+        tools = [
+            ["gnome-screenshot", "-a", "-f", screenshot_path],
+            ["maim", "-s", screenshot_path],
+            ["import", screenshot_path],
+            ["scrot", "-s", screenshot_path]
+        ]
+
+    for tool in tools:
+        try:
+            subprocess.run(tool, check=True)
+            return True
+        except (subprocess.SubprocessError, FileNotFoundError):
+            continue
+    return False
@@ -0,0 +1,232 @@
+"""
+Shared-memory transport for handing images to worker processes.
+
+Instead of pickling a full PIL image for every task, the pixels are copied
+once into a multiprocessing.shared_memory segment and only a small
+descriptor (segment name, shape, dtype) is sent to the worker.
+
+Run this file directly to compare it against the pickling baseline:
+
+    python shm_transport.py --width 3840 --height 2160 --tasks 32
+"""
+import sys
+import time
+import argparse
+import threading
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+from PIL import Image
+
+# Everything a worker needs to rebuild the pixel array
+ImageDescriptor = namedtuple("ImageDescriptor", ["name", "shape", "dtype"])
+
+# Segments owned by this process: name -> [SharedMemory, refcount]
+_segments = {}
+_segments_lock = threading.Lock()
+# Serialises segment creation with _open_segment's resource tracker patch
+_attach_lock = threading.Lock()
+
+
+def share_image(image):
+    """Copy an image into a new shared memory segment and return its descriptor.
+
+    The segment starts with a reference count of 1; call release() when done.
+    """
+    pixels = np.asarray(image)
+    # Held so _open_segment can't swap out the tracker registration meanwhile
+    with _attach_lock:
+        shm = shared_memory.SharedMemory(create=True, size=max(pixels.nbytes, 1))
+    shared = np.ndarray(pixels.shape, dtype=pixels.dtype, buffer=shm.buf)
+    shared[...] = pixels
+    del shared  # Drop the view so the segment can be closed later
+
+    descriptor = ImageDescriptor(shm.name, pixels.shape, pixels.dtype.str)
+    with _segments_lock:
+        _segments[shm.name] = [shm, 1]
+    return descriptor
+
+
+def retain(descriptor):
+    """Take an extra reference on a segment owned by this process"""
+    with _segments_lock:
+        _segments[descriptor.name][1] += 1
+    return descriptor
+
+
+def release(descriptor):
+    """Drop a reference; the segment is unlinked when the last one goes away"""
+    with _segments_lock:
+        entry = _segments.get(descriptor.name)
+        if entry is None:
+            return
+        entry[1] -= 1
+        if entry[1] > 0:
+            return
+        del _segments[descriptor.name]
+
+    shm = entry[0]
+    shm.close()
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def live_segments():
+    """Return the number of segments this process still owns"""
+    with _segments_lock:
+        return len(_segments)
+
+
+def _open_segment(name):
+    """Attach to an existing segment without letting this process own it"""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+
+    # Older Pythons register attached segments with the resource tracker too.
+    # A worker forked before the owner started its tracker gets a tracker of
+    # its own, which would unlink the segment when the worker exits, so
+    # registration is skipped the way track=False does on 3.13.
+    from multiprocessing import resource_tracker
+    with _attach_lock:
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+class attach_image:
+    """Context manager giving a worker read access to a shared image.
+
+    Yields a NumPy array backed directly by the shared segment; it must not
+    be used after the block exits.
+    """
+
+    def __init__(self, descriptor):
+        self.descriptor = descriptor
+        self.shm = None
+        self.array = None
+
+    def __enter__(self):
+        self.shm = _open_segment(self.descriptor.name)
+        self.array = np.ndarray(
+            self.descriptor.shape,
+            dtype=np.dtype(self.descriptor.dtype),
+            buffer=self.shm.buf,
+        )
+        self.array.flags.writeable = False
+        return self.array
+
+    def __exit__(self, *exc):
+        self.array = None
+        self.shm.close()
+        return False
+
+
+def load_shared_image(descriptor):
+    """Return a PIL image with its own copy of the shared pixels.
+
+    Image.fromarray maps L and RGBA buffers instead of copying them, so the
+    array is copied before the segment is closed.
+    """
+    with attach_image(descriptor) as pixels:
+        return Image.fromarray(pixels.copy())
+
+
+def ocr_shared_image(descriptor, lang="eng"):
+    """Worker entry point: run Tesseract on an image passed by descriptor"""
+    import pytesseract
+
+    return pytesseract.image_to_string(load_shared_image(descriptor), lang=lang)
+
+
+def recognize_in_pool(executor, images, lang="eng"):
+    """Recognize several images in a process pool using shared memory.
+
+    Results are returned in the same order as the input images.
+    """
+    descriptors = [share_image(image) for image in images]
+    try:
+        futures = [executor.submit(ocr_shared_image, d, lang) for d in descriptors]
+        return [future.result() for future in futures]
+    finally:
+        for descriptor in descriptors:
+            release(descriptor)
+
+
+# --- Benchmark -------------------------------------------------------------
+
+def _checksum_pickled(image):
+    """Baseline worker: receives a pickled PIL image"""
+    return int(np.asarray(image)[::64, ::64].sum())
+
+
+def _checksum_shared(descriptor):
+    """Shared memory worker: receives only a descriptor"""
+    with attach_image(descriptor) as pixels:
+        return int(pixels[::64, ::64].sum())
+
+
+def _time_it(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def benchmark(width=3840, height=2160, tasks=32, workers=4, ocr=False, lang="eng"):
+    """Compare pickled images against shared memory descriptors"""
+    rng = np.random.default_rng(0)
+    pixels = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+    image = Image.fromarray(pixels, "RGB")
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Warm the pool so process start-up isn't counted
+        list(executor.map(_checksum_pickled, [Image.new("RGB", (1, 1))] * workers))
+
+        def run_pickled():
+            return list(executor.map(_checksum_pickled, [image] * tasks))
+
+        def run_shared():
+            descriptor = share_image(image)
+            try:
+                return list(executor.map(_checksum_shared, [descriptor] * tasks))
+            finally:
+                release(descriptor)
+
+        pickled_time, pickled_result = _time_it(run_pickled)
+        shared_time, shared_result = _time_it(run_shared)
+        assert pickled_result == shared_result
+
+        print(f"Image: {width} × {height} px, {tasks} tasks, {workers} workers")
+        print(f"  pickle:        {pickled_time * 1000:8.1f} ms "
+              f"({pickled_time / tasks * 1000:.2f} ms/task)")
+        print(f"  shared memory: {shared_time * 1000:8.1f} ms "
+              f"({shared_time / tasks * 1000:.2f} ms/task)")
+        print(f"  speed-up:      {pickled_time / shared_time:8.1f}×")
+
+        if ocr:
+            text_image = Image.new("RGB", (width, height), "white")
+            ocr_time, _ = _time_it(
+                lambda: recognize_in_pool(executor, [text_image] * tasks, lang)
+            )
+            print(f"  tesseract:     {ocr_time * 1000:8.1f} ms "
+                  f"({ocr_time / tasks * 1000:.2f} ms/task)")
+
+    assert live_segments() == 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark image transport to worker processes")
+    parser.add_argument("--width", type=int, default=3840)
+    parser.add_argument("--height", type=int, default=2160)
+    parser.add_argument("--tasks", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--ocr", action="store_true", help="Also time Tesseract over shared memory")
+    parser.add_argument("--lang", default="eng")
+    args = parser.parse_args()
+    benchmark(args.width, args.height, args.tasks, args.workers, args.ocr, args.lang)
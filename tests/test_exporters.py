@@ -0,0 +1,96 @@
+import io
+import json
+import os
+import xml.etree.ElementTree as ET
+
+import pytest
+from PIL import Image
+
+import exporters
+
+LINES = [
+    {"block": 1, "bbox": (10, 10, 120, 14), "words": [
+        {"text": "Hello", "bbox": (10, 10, 40, 14), "conf": 91},
+        {"text": "Wörld(1)", "bbox": (60, 10, 70, 14), "conf": 88},
+    ]},
+    {"block": 2, "bbox": (10, 40, 90, 14), "words": [
+        {"text": "Привет", "bbox": (10, 40, 50, 14), "conf": 75},
+        {"text": "<мир>", "bbox": (70, 40, 30, 14), "conf": 60},
+    ]},
+]
+
+
+def _export(cls, path, pages=2):
+    image = Image.new("RGB", (200, 80), "white")
+    with cls(str(path)) as exporter:
+        for _ in range(pages):
+            exporter.add_page(image, LINES, "scan.png")
+    return path.read_bytes()
+
+
+@pytest.mark.parametrize("fmt", sorted(exporters.EXPORTERS))
+def test_output_is_byte_reproducible(tmp_path, fmt):
+    cls = exporters.EXPORTERS[fmt]
+    first = _export(cls, tmp_path / ("a" + cls.extension))
+    second = _export(cls, tmp_path / ("b" + cls.extension))
+    assert first == second
+    assert not list(tmp_path.glob("*.part"))
+
+
+def test_xml_formats_are_well_formed(tmp_path):
+    for fmt in ("hocr", "alto"):
+        cls = exporters.EXPORTERS[fmt]
+        ET.fromstring(_export(cls, tmp_path / ("out" + cls.extension)))
+
+
+def test_jsonl_has_one_record_per_page(tmp_path):
+    records = [json.loads(line) for line in _export(exporters.JsonlExporter, tmp_path / "out.jsonl", 3).splitlines()]
+    assert [r["page"] for r in records] == [1, 2, 3]
+    assert records[0]["lines"][1]["words"][0] == {"text": "Привет", "bbox": [10, 40, 50, 14], "conf": 75}
+
+
+def test_pdf_text_layer_is_unicode_with_spaces(tmp_path):
+    pypdf = pytest.importorskip("pypdf")
+    path = tmp_path / "out.pdf"
+    _export(exporters.PdfExporter, path)
+
+    reader = pypdf.PdfReader(str(path))
+    assert len(reader.pages) == 2
+    text = reader.pages[0].extract_text()
+    assert "Hello Wörld(1)" in text
+    assert "Привет <мир>" in text
+
+
+def test_pdf_embeds_glyphless_font(tmp_path):
+    pypdf = pytest.importorskip("pypdf")
+    path = tmp_path / "out.pdf"
+    _export(exporters.PdfExporter, path)
+
+    font = pypdf.PdfReader(str(path)).pages[0]["/Resources"]["/Font"]["/F1"]
+    cid_font = font["/DescendantFonts"][0].get_object()
+    font_file = cid_font["/FontDescriptor"]["/FontFile2"].get_object()
+    assert font_file.get_data() == exporters.GLYPHLESS_FONT
+    assert font_file["/Length1"] == len(exporters.GLYPHLESS_FONT)
+    # Every two-byte CID maps to glyph 1
+    assert cid_font["/CIDToGIDMap"].get_object().get_data() == b"\x00\x01" * 65536
+
+
+def test_glyphless_font_is_valid_truetype():
+    ttLib = pytest.importorskip("fontTools.ttLib")
+    font = ttLib.TTFont(io.BytesIO(exporters.GLYPHLESS_FONT), checkChecksums=2)
+    assert font["maxp"].numGlyphs == 2
+    assert font["head"].unitsPerEm == 1000
+    assert font["hmtx"]["glyph00001"] == (500, 0)
+    assert font["name"].getDebugName(6) == "GlyphLessFont"
+
+
+def test_failed_batch_leaves_no_output(tmp_path):
+    path = tmp_path / "out.pdf"
+    image = Image.new("RGB", (20, 20), "white")
+    with pytest.raises(RuntimeError):
+        with exporters.PdfExporter(str(path)) as exporter:
+            exporter.add_page(image, LINES, "scan.png")
+            raise RuntimeError("recognition failed")
+
+    assert not path.exists()
+    assert not os.listdir(tmp_path)
@@ -0,0 +1,197 @@
+import sys
+import types
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+import incremental
+
+LINE_HEIGHT = 20
+
+
+class FakeTesseract:
+    """Stands in for pytesseract: 'reads' the lines drawn on the current page"""
+
+    def __init__(self):
+        self.page = None
+        self.layout = []  # (text, x, y) of every drawn line
+        self.calls = []
+
+    def show(self, layout, size=(400, 300), contrast=0):
+        image = Image.new("RGB", size, "white")
+        draw = ImageDraw.Draw(image)
+        for text, x, y in layout:
+            draw.text((x, y), text, fill=(contrast, contrast, contrast))
+        self.page = np.asarray(image)
+        self.layout = layout
+        return image
+
+    def _locate(self, image):
+        crop = np.asarray(image)
+        for top in range(self.page.shape[0] - crop.shape[0] + 1):
+            if np.array_equal(self.page[top:top + crop.shape[0]], crop):
+                return top
+        raise AssertionError("crop is not part of the page")
+
+    def _data(self, image):
+        top = self._locate(image)
+        data = {k: [] for k in ("level", "block_num", "par_num", "line_num", "left", "top", "height", "text")}
+        for number, (text, x, y) in enumerate(self.layout):
+            if not top <= y + 5 < top + image.height:
+                continue
+            for i, word in enumerate(text.split()):
+                for key, value in (("level", 5), ("block_num", 1), ("par_num", 1), ("line_num", number),
+                                   ("left", x + 10 * i), ("top", y - top), ("height", 10), ("text", word)):
+                    data[key].append(value)
+        return data
+
+    def image_to_data(self, image, lang=None, config="", output_type=None):
+        self.calls.append(("region", image.height))
+        return self._data(image)
+
+    def run_and_get_multiple_output(self, image, extensions, lang=None):
+        self.calls.append(("full", image.height))
+        data = self._data(image)
+        header = list(data)
+        rows = ["\t".join(header)] + ["\t".join(str(data[h][i]) for h in header) for i in range(len(data["text"]))]
+        # Marked so tests can tell Tesseract's own text output from spliced text
+        return "TXT:" + "|".join(text for text, _, _ in self.layout) + "\f", "\n".join(rows) + "\n"
+
+
+@pytest.fixture
+def tesseract(monkeypatch):
+    fake = FakeTesseract()
+    module = types.SimpleNamespace(
+        image_to_data=fake.image_to_data,
+        run_and_get_multiple_output=fake.run_and_get_multiple_output,
+        Output=types.SimpleNamespace(DICT="dict"),
+    )
+    monkeypatch.setitem(sys.modules, "pytesseract", module)
+    return fake
+
+
+def document(lines, scroll=0, x=10, height=300):
+    layout = []
+    for i, text in enumerate(lines):
+        y = 10 + i * LINE_HEIGHT - scroll
+        if 0 <= y < height - 12:
+            layout.append((text, x, y))
+    return layout
+
+
+DOC = [f"Line number {i} of the document" for i in range(40)]
+
+
+def test_first_capture_uses_tesseract_text_output(tesseract):
+    recognizer = incremental.IncrementalRecognizer()
+    text = recognizer.recognize(tesseract.show(document(DOC)))
+    assert text.startswith("TXT:")
+    assert recognizer.last_stats["full"]
+    assert tesseract.calls == [("full", 300)]
+
+
+def test_scrolling_only_recognizes_new_lines(tesseract):
+    recognizer = incremental.IncrementalRecognizer()
+    recognizer.recognize(tesseract.show(document(DOC)))
+
+    tesseract.calls.clear()
+    layout = document(DOC, scroll=3 * LINE_HEIGHT)
+    text = recognizer.recognize(tesseract.show(layout))
+
+    assert text.split("\n") == [line for line, _, _ in layout]
+    assert recognizer.last_stats["recognized"] == 3
+    assert recognizer.last_stats["offset"] == (0, 3 * LINE_HEIGHT)
+    assert [kind for kind, _ in tesseract.calls] == ["region"]
+
+
+def test_horizontal_nudge_reuses_lines(tesseract):
+    recognizer = incremental.IncrementalRecognizer()
+    first = recognizer.recognize(tesseract.show(document(DOC)))
+
+    tesseract.calls.clear()
+    second = recognizer.recognize(tesseract.show(document(DOC, x=13)))
+    assert recognizer.last_stats["recognized"] == 0
+    assert tesseract.calls == []
+    assert second == first
+
+
+def test_identical_capture_returns_identical_text(tesseract):
+    recognizer = incremental.IncrementalRecognizer()
+    image = tesseract.show(document(DOC))
+    first = recognizer.recognize(image)
+
+    tesseract.calls.clear()
+    assert recognizer.recognize(image) == first
+    assert recognizer.recognize(image) == first
+    assert recognizer.last_stats["recognized"] == 0
+    assert tesseract.calls == []
+
+
+@pytest.mark.parametrize("before, after", [
+    ("Total due: EUR 1050.00", "Total due: EUR 1650.00"),
+    ("Total due: EUR 1050.00", "Total due: EUR 1058.00"),
+    ("Total due: EUR 1090.00", "Total due: EUR 1060.00"),
+    ("the illusion of control", "the lllusion of control"),
+    ("then the hen ran", "then the nen ran"),
+    ("a coat of paint", "a cost of paint"),
+    ("recent events", "recent evants"),
+])
+def test_one_glyph_change_is_recognized_again(tesseract, before, after):
+    lines = list(DOC[:12])
+    lines[5] = before
+    recognizer = incremental.IncrementalRecognizer()
+    recognizer.recognize(tesseract.show(document(lines)))
+
+    lines[5] = after
+    tesseract.calls.clear()
+    text = recognizer.recognize(tesseract.show(document(lines)))
+
+    assert recognizer.last_stats["recognized"] == 1
+    assert [kind for kind, _ in tesseract.calls] == ["region"]
+    assert after in text.split("\n")
+    assert before not in text.split("\n")
+
+
+def test_every_confusable_single_glyph_edit_is_caught(tesseract):
+    line = "invoice line: amount 1050.00 EUR, paid on 06/09/2024 - hello world, code cabbage 6890"
+    swaps = {"i": "l", "l": "i", "n": "h", "h": "n", "a": "o", "o": "a", "e": "c", "c": "e",
+             "0": "8", "8": "0", "9": "6", "6": "9", "5": "6", "1": "7"}
+    lines = list(DOC[:8])
+    recognizer = incremental.IncrementalRecognizer()
+
+    missed = []
+    for position, char in enumerate(line):
+        if char not in swaps:
+            continue
+        lines[3] = line
+        recognizer.recognize(tesseract.show(document(lines, x=2), size=(560, 200)))
+        lines[3] = line[:position] + swaps[char] + line[position + 1:]
+        recognizer.recognize(tesseract.show(document(lines, x=2), size=(560, 200)))
+        if recognizer.last_stats["recognized"] != 1:
+            missed.append(position)
+
+    assert missed == []
+
+
+def test_two_columns_use_full_recognition(tesseract):
+    left = [f"left column line {i}" for i in range(12)]
+    right = [f"right {i}" for i in range(12)]
+    layout = document(left) + document(right, x=300)
+
+    recognizer = incremental.IncrementalRecognizer()
+    recognizer.recognize(tesseract.show(layout))
+    text = recognizer.recognize(tesseract.show(layout))
+
+    assert recognizer.last_stats["full"]
+    assert text.startswith("TXT:")
+
+
+def test_low_contrast_text_still_goes_to_tesseract(tesseract):
+    recognizer = incremental.IncrementalRecognizer()
+    # Light grey text, closer to the background than INK_THRESHOLD
+    text = recognizer.recognize(tesseract.show(document(DOC[:5]), contrast=220))
+
+    assert recognizer.last_stats["bands"] == 0
+    assert tesseract.calls == [("full", 300)]
+    assert text.startswith("TXT:")
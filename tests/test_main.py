@@ -0,0 +1,104 @@
+import pytest
+
+pytest.importorskip("pytesseract")
+pytest.importorskip("pyperclip")
+pytest.importorskip("tkinter")
+
+import main
+
+
+class FakeRoot:
+    def __init__(self):
+        self.jobs = {}
+        self.next_id = 0
+
+    def after(self, delay, func, *args):
+        self.next_id += 1
+        self.jobs[self.next_id] = (func, args)
+        return self.next_id
+
+    def after_cancel(self, job):
+        del self.jobs[job]
+
+    def run_pending(self):
+        while self.jobs:
+            job = min(self.jobs)
+            func, args = self.jobs.pop(job)
+            func(*args)
+
+
+class FakeText:
+    def __init__(self):
+        self.content = ""
+        self.inserts = []
+
+    def delete(self, start, end):
+        self.content = ""
+
+    def insert(self, index, text):
+        self.inserts.append(text)
+        self.content += text
+
+
+@pytest.fixture
+def panel(monkeypatch):
+    root, text_widget = FakeRoot(), FakeText()
+    monkeypatch.setattr(main, "root", root, raising=False)
+    monkeypatch.setattr(main, "text_widget", text_widget, raising=False)
+    monkeypatch.setattr(main, "text_insert_job", None)
+    return root, text_widget
+
+
+def _chunks(text, size):
+    start, chunks = 0, []
+    while start < len(text):
+        end = main.chunk_end(text, start, size)
+        chunks.append(text[start:end])
+        start = end
+    return chunks
+
+
+def test_chunks_break_after_last_newline():
+    assert _chunks("aaa\nbb\ncccc\nd", 8) == ["aaa\nbb\n", "cccc\nd"]
+
+
+def test_line_longer_than_chunk_is_cut_at_chunk_size():
+    assert _chunks("x" * 20 + "\nyy", 8) == ["x" * 8, "x" * 8, "xxxx\nyy"]
+
+
+def test_newline_at_chunk_start_does_not_give_empty_chunk():
+    assert _chunks("\n" + "x" * 10, 4) == ["\nxxx", "xxxx", "xxx"]
+
+
+def test_small_text_is_inserted_at_once(panel):
+    root, text_widget = panel
+    text = "line\n" * (main.LARGE_TEXT_THRESHOLD // 5)
+    main.set_text(text)
+    assert text_widget.inserts == [text]
+    assert root.jobs == {}
+
+
+def test_large_text_is_inserted_in_chunks(panel):
+    root, text_widget = panel
+    text = "".join(f"line {i}\n" for i in range(20000))
+    main.set_text(text)
+    assert len(text_widget.inserts) == 1 and root.jobs
+
+    root.run_pending()
+    assert text_widget.content == text
+    assert all(chunk.endswith("\n") for chunk in text_widget.inserts)
+    assert max(map(len, text_widget.inserts)) <= main.TEXT_CHUNK_SIZE
+    assert main.text_insert_job is None
+
+
+def test_new_result_cancels_pending_insert(panel):
+    root, text_widget = panel
+    main.set_text("old\n" * 50000)
+    pending = main.text_insert_job
+    assert pending in root.jobs
+
+    main.set_text("new")
+    assert pending not in root.jobs
+    root.run_pending()
+    assert text_widget.content == "new"
+    assert main.current_text == "new"
@@ -0,0 +1,87 @@
+import os
+import tempfile
+import threading
+import time
+
+from pipeline import CapturePipeline, CaptureJob
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def _collect(pipeline, count, timeout=2.0):
+    finished = []
+    _wait_for(lambda: finished.extend(pipeline.get_results()) or len(finished) >= count, timeout)
+    return finished
+
+
+def test_results_keep_submission_order_and_failures_pass_through():
+    def fail_second(job):
+        if job.id == second:
+            raise ValueError("boom")
+
+    pipeline = CapturePipeline([("a", lambda job: time.sleep(0.001)), ("b", fail_second)], maxsize=2)
+    jobs = []
+    for _ in range(6):
+        job = CaptureJob()
+        _wait_for(lambda: pipeline.submit(job))
+        jobs.append(job)
+        if len(jobs) == 2:
+            second = job.id
+
+    finished = _collect(pipeline, 6)
+    assert [job.id for job in finished] == [job.id for job in jobs]
+    assert [job.error for job in finished if job.error] == ["b failed: boom"]
+    assert pipeline.pending() == 0
+
+
+def test_jobs_waiting_on_backpressure_are_counted():
+    release = threading.Event()
+    pipeline = CapturePipeline([("a", lambda job: None), ("b", lambda job: release.wait())], maxsize=1)
+
+    # b holds one job, its queue holds one, a holds one waiting to hand it over
+    for _ in range(4):
+        assert pipeline.submit(CaptureJob())
+        time.sleep(0.05)
+    _wait_for(lambda: pipeline.stages[0].inbox.qsize() == 1)
+
+    assert pipeline.pending() == 4
+    assert pipeline.pending("a") == 2
+    assert pipeline.pending("b") == 2
+    assert not pipeline.submit(CaptureJob())
+
+    release.set()
+    assert len(_collect(pipeline, 4)) == 4
+    assert pipeline.pending() == 0
+
+
+def test_shutdown_does_not_block_when_full():
+    release = threading.Event()
+    pipeline = CapturePipeline([("a", lambda job: release.wait())], maxsize=1)
+    pipeline.submit(CaptureJob())
+    _wait_for(lambda: pipeline.stages[0].busy)
+    pipeline.submit(CaptureJob())
+
+    start = time.monotonic()
+    pipeline.shutdown()
+    assert time.monotonic() - start < 0.5
+    release.set()
+
+
+def test_temporary_files_are_removed_for_failed_jobs():
+    fd, path = tempfile.mkstemp(suffix=".png")
+    os.close(fd)
+
+    def cancelled(job):
+        raise RuntimeError("Screenshot was not captured.")
+
+    pipeline = CapturePipeline([("capture", cancelled), ("decode", lambda job: None)])
+    pipeline.submit(CaptureJob(path, temporary=True, capture=True))
+
+    (job,) = _collect(pipeline, 1)
+    assert job.error
+    assert not os.path.exists(path)
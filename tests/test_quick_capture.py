@@ -0,0 +1,64 @@
+import subprocess
+import sys
+import types
+
+import quick_capture
+
+
+def test_importing_launcher_does_not_load_heavy_modules():
+    code = ("import sys, quick_capture, screen_capture; "
+            "print(sorted(m for m in ('pynput', 'PIL', 'pytesseract', 'tkinter') if m in sys.modules))")
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            cwd=quick_capture.os.path.dirname(quick_capture.__file__), check=True)
+    assert output.stdout.strip() == "[]"
+
+
+def test_stats_report_selection_and_hotkey_latency_separately():
+    stats = quick_capture.LatencyStats()
+    assert stats.summary() == "No captures yet"
+
+    stats.record(2.0, 0.25)
+    stats.record(4.0, 0.75)
+    summary = stats.summary().splitlines()
+    assert summary[0] == "2 captures"
+    assert "selection-to-clipboard: mean 500 ms" in summary[1]
+    assert "hotkey-to-clipboard   : mean 3000 ms" in summary[2]
+
+
+
+def test_macos_notification_passes_text_as_arguments(monkeypatch):
+    calls = []
+    monkeypatch.setattr(quick_capture.platform, "system", lambda: "Darwin")
+    monkeypatch.setattr(quick_capture.subprocess, "run", lambda args, **kwargs: calls.append(args))
+
+    message = 'x" & (do shell script "touch /tmp/pwn") & "\ndon\'t \\ stop'
+    quick_capture.notify('Title "quoted"', message)
+
+    args = calls[0]
+    assert args[0] == "osascript"
+    assert args[-3:] == ["--", message, 'Title "quoted"']
+    script = " ".join(args[1:-3])
+    assert "pwn" not in script and "don" not in script and "quoted" not in script
+
+
+def test_capture_releases_lock_when_temp_file_fails(monkeypatch):
+    def no_space(**kwargs):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(quick_capture.tempfile, "mkstemp", no_space)
+    monkeypatch.setattr(quick_capture, "notify", lambda title, message: None)
+    quick = quick_capture.QuickCapture()
+
+    assert quick.capture() == (None, None, None)
+    assert quick.lock.acquire(blocking=False)
+
+
+def test_second_resident_process_does_not_grab_hotkey(monkeypatch):
+    grabbed = []
+    pynput = types.ModuleType("pynput")
+    pynput.keyboard = types.SimpleNamespace(GlobalHotKeys=lambda hotkeys: grabbed.append(hotkeys))
+    monkeypatch.setitem(sys.modules, "pynput", pynput)
+    monkeypatch.setattr(quick_capture, "send_command", lambda command: "1 captures")
+
+    quick_capture.serve()
+    assert grabbed == []
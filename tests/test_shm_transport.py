@@ -0,0 +1,73 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import shm_transport
+
+
+def _image(mode):
+    rng = np.random.default_rng(0)
+    channels = {"L": (), "RGB": (3,), "RGBA": (4,)}[mode]
+    pixels = rng.integers(0, 256, size=(37, 53) + channels, dtype=np.uint8)
+    return Image.fromarray(pixels, mode)
+
+
+def _roundtrip(descriptor):
+    image = shm_transport.load_shared_image(descriptor)
+    return image.mode, image.size, image.tobytes(), image.getpixel((5, 7))
+
+
+@pytest.mark.parametrize("mode", ["L", "RGB", "RGBA"])
+def test_load_shared_image_outlives_segment(mode):
+    image = _image(mode)
+    descriptor = shm_transport.share_image(image)
+    try:
+        loaded = shm_transport.load_shared_image(descriptor)
+    finally:
+        shm_transport.release(descriptor)
+
+    # The segment is gone; the image must still be readable
+    assert shm_transport.live_segments() == 0
+    assert loaded.mode == mode
+    assert loaded.getpixel((5, 7)) == image.getpixel((5, 7))
+    assert loaded.tobytes() == image.tobytes()
+
+
+@pytest.mark.parametrize("mode", ["L", "RGB", "RGBA"])
+def test_worker_process_receives_image(mode):
+    image = _image(mode)
+    descriptor = shm_transport.share_image(image)
+    try:
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            result = executor.submit(_roundtrip, descriptor).result()
+    finally:
+        shm_transport.release(descriptor)
+
+    assert result == (mode, image.size, image.tobytes(), image.getpixel((5, 7)))
+    assert shm_transport.live_segments() == 0
+
+
+def test_segment_is_unlinked_after_last_release():
+    descriptor = shm_transport.share_image(_image("RGB"))
+    shm_transport.retain(descriptor)
+    shm_transport.release(descriptor)
+    assert shm_transport.live_segments() == 1
+    shm_transport.release(descriptor)
+    assert shm_transport.live_segments() == 0
+
+
+def test_share_image_waits_for_attach_in_progress():
+    # While an attach has the tracker registration patched out, a new
+    # segment must not be created (it would never be registered)
+    descriptors = []
+    with shm_transport._attach_lock:
+        worker = threading.Thread(target=lambda: descriptors.append(shm_transport.share_image(_image("L"))))
+        worker.start()
+        worker.join(0.2)
+        assert worker.is_alive() and descriptors == []
+    worker.join()
+    shm_transport.release(descriptors[0])
+    assert shm_transport.live_segments() == 0